@@ -10,13 +10,61 @@ from PyQt5.QtWidgets import QAction
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QKeySequence
 import os
+import stat
 import json
+import hashlib
+import time
+import traceback
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from operator import attrgetter
+
+# orjson is much faster for the small JSON files we read at startup,
+# but it is not bundled with Krita so fall back to the stdlib module.
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+# Console logging is off by default, set RUNSCRIPTZ_DEBUG=1 to enable it
+DEBUG = os.environ.get("RUNSCRIPTZ_DEBUG") == "1"
+
+def log(msg, *args):
+    """Print a debug message; args are %-formatted only when logging is enabled"""
+    if DEBUG:
+        print("[RunScriptz] " + (msg % args if args else msg))
+
+@lru_cache(maxsize=None)
+def _app_data_file(filename):
+    """
+    Path of a file in Krita's app data folder.
+    Resolved on first use so importing the plugin doesn't query Krita's app data location.
+    """
+    return os.path.join(
+        Krita.instance().getAppDataLocation() or os.path.expanduser("~"),
+        filename
+    )
+
+def get_hotkey_file():
+    """Configuration file for hotkeys"""
+    return _app_data_file("run_scriptz_hotkeys.json")
 
-# Configuration file for hotkeys
-HOTKEY_FILE = os.path.join(
-    Krita.instance().getAppDataLocation() or os.path.expanduser("~"),
-    "run_scriptz_hotkeys.json"
-)
+def get_config_file():
+    """Configuration file holding the scripts folder"""
+    return _app_data_file("run_scriptz_config.json")
+
+# Prefixes of the script action ids/texts and the file suffixes treated as scripts
+ACTION_ID_PREFIX = "run_scriptz_"
+ACTION_TEXT_PREFIX = "RunScriptz: "
+SCRIPT_SUFFIXES = (".py",)
 
 class RunScriptzAction(QAction):
     """Custom action class for RunScriptz commands"""
@@ -30,22 +78,83 @@ class RunScriptzAction(QAction):
     def run_script(self):
         """Execute the associated script"""
         if not os.path.exists(self.script_path):
-            print(f"[RunScriptz] Script not found: {self.script_path}")
+            log("Script not found: %s", self.script_path)
             return
         
         try:
-            import importlib.util
-            spec = importlib.util.spec_from_file_location("run_scriptz_external", self.script_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            
+            namespace = exec_script(self.script_path)
+
             # Try to call main() function if it exists
-            if hasattr(module, "main"):
-                module.main()
+            main = namespace.get("main")
+            if callable(main):
+                main()
             else:
-                print(f"[RunScriptz] Executed {os.path.basename(self.script_path)}")
+                log("Executed %s", os.path.basename(self.script_path))
         except Exception as e:
-            print(f"[RunScriptz] Error running {self.script_path}: {e}")
+            log("Error running %s: %s", self.script_path, e)
+
+# Compiled scripts: script_path -> (mtime_ns, code object)
+_code_cache = {}
+
+def get_compiled_script(script_path):
+    """
+    Return the compiled code object for a script.
+    The code is cached and only recompiled when the file's mtime changes.
+    Raises OSError if the file can't be read and SyntaxError if it doesn't compile.
+    """
+    st = os.stat(script_path)
+    cached = _code_cache.get(script_path)
+    if cached and cached[0] == st.st_mtime_ns:
+        return cached[1]
+
+    with open(script_path, "rb") as f:
+        source = f.read()
+    code = compile(source, script_path, "exec")
+    _code_cache[script_path] = (st.st_mtime_ns, code)
+    return code
+
+def exec_script(script_path):
+    """Execute a script in a fresh namespace and return that namespace"""
+    namespace = {"__name__": "run_scriptz_external", "__file__": script_path}
+    exec(get_compiled_script(script_path), namespace)
+    return namespace
+
+def _scan_scripts_folder(scripts_folder):
+    """
+    Read the scripts folder in a single os.scandir pass. Scripts are looked up
+    in the folder and one level of subfolders, see _iter_scripts().
+    Returns (files, dirs): the root scripts and the visible subfolders as
+    DirEntry lists sorted by name. Raises OSError if the folder can't be read.
+    """
+    files = []
+    dirs = []
+    with os.scandir(scripts_folder) as it:
+        for entry in it:
+            name = entry.name
+            if name.endswith(SCRIPT_SUFFIXES) and entry.is_file():
+                files.append(entry)
+            elif not name.startswith('.') and entry.is_dir():
+                dirs.append(entry)
+
+    files.sort(key=attrgetter("name"))
+    dirs.sort(key=attrgetter("name"))
+    return files, dirs
+
+def _iter_scripts(files, dirs):
+    """Yield (key, full_path) for the result of _scan_scripts_folder()"""
+    for entry in files:
+        yield (entry.name, entry.path)
+
+    for entry in dirs:
+        try:
+            with os.scandir(entry.path) as sub_it:
+                sub_files = [sub for sub in sub_it if sub.name.endswith(SCRIPT_SUFFIXES)]
+        except OSError:
+            continue
+        key_prefix = entry.name + "/"
+        for sub in sorted(sub_files, key=attrgetter("name")):
+            # Consistent with runscriptz.py logic: folder/filename
+            yield (key_prefix + sub.name, sub.path)
 
 def get_all_scripts(scripts_folder):
     """
@@ -54,28 +163,81 @@ def get_all_scripts(scripts_folder):
     For subfolder files, key is relative path (e.g. 'sub/foo.py').
     """
     try:
-        # 1. Root files
-        for fname in sorted(os.listdir(scripts_folder)):
-            fpath = os.path.join(scripts_folder, fname)
-            if os.path.isfile(fpath) and fname.endswith(".py"):
-                yield (fname, fpath)
-        
-        # 2. Subfolders
-        for dname in sorted(os.listdir(scripts_folder)):
-            dpath = os.path.join(scripts_folder, dname)
-            if os.path.isdir(dpath) and not dname.startswith('.'):
-                try:
-                    for fname in sorted(os.listdir(dpath)):
-                        if fname.endswith(".py"):
-                            # Consistent with runscriptz.py logic: folder/filename
-                            rel_path = f"{dname}/{fname}"
-                            fpath = os.path.join(dpath, fname)
-                            yield (rel_path, fpath)
-                except:
-                    continue
-    except Exception as e:
-        print(f"[RunScriptz] Error scanning scripts: {e}")
+        files, dirs = _scan_scripts_folder(scripts_folder)
+        yield from _iter_scripts(files, dirs)
+    except OSError as e:
+        log("Error scanning scripts: %s", e)
+
+# Result of the last folder walk, reused while nothing in the folder changed
+_scripts_cache = {"folder": None, "mtime": 0, "subdirs": (), "sub_mtimes": (), "entries": None}
+
+def _get_mtimes(paths):
+    """Return a tuple with the mtime of each path (None if it is gone)"""
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+def _dir_stat(path):
+    """Return the os.stat() result of path if it is a directory, else None"""
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISDIR(st.st_mode) else None
 
+def get_all_scripts_cached(scripts_folder, st=None):
+    """
+    Cached version of get_all_scripts() returning a list of (key, full_path).
+    The folder is only walked again when its mtime or the mtime of one of its
+    subfolders changed since the last walk.
+    Pass st (an os.stat() result of the folder) when the caller already has one.
+    """
+    if st is None:
+        try:
+            st = os.stat(scripts_folder)
+        except OSError:
+            return []
+
+    cache = _scripts_cache
+    if (cache["folder"] == scripts_folder
+            and cache["mtime"] == st.st_mtime_ns
+            and cache["sub_mtimes"] == _get_mtimes(cache["subdirs"])):
+        return cache["entries"]
+
+    try:
+        files, dirs = _scan_scripts_folder(scripts_folder)
+    except OSError as e:
+        log("Error scanning scripts: %s", e)
+        return []
+    subdirs = tuple(entry.path for entry in dirs)
+    sub_mtimes = _get_mtimes(subdirs)
+    entries = list(_iter_scripts(files, dirs))
+
+    cache["folder"] = scripts_folder
+    cache["mtime"] = st.st_mtime_ns
+    cache["subdirs"] = subdirs
+    cache["sub_mtimes"] = sub_mtimes
+    cache["entries"] = entries
+    return entries
+
+def invalidate_scripts_cache():
+    """Drop the cached folder walk so the next lookup rescans the folder"""
+    _scripts_cache["folder"] = None
+    _scripts_cache["entries"] = None
+    get_action_id_for_key.cache_clear()
+
+@lru_cache(maxsize=256)
+def _kseq(shortcut_str):
+    """Return the QKeySequence for a shortcut string, parsed once per distinct string"""
+    return QKeySequence(shortcut_str)
+
+@lru_cache(maxsize=4096)
 def get_action_id_for_key(script_key):
     """
     Generate a safe action ID from the script key.
@@ -84,8 +246,22 @@ def get_action_id_for_key(script_key):
     """
     # Replace path separators with underscores for ID safety
     safe_suffix = script_key.replace("/", "_").replace("\\", "_")
-    return f"run_scriptz_{safe_suffix}"
+    return ACTION_ID_PREFIX + safe_suffix
 
+def get_known_actions():
+    """
+    Krita's RunScriptz actions by action ID, from a single actions() call.
+    Looking many IDs up in this dict replaces one app.action() scan per ID.
+    """
+    known = {}
+    try:
+        for action in Krita.instance().actions():
+            name = action.objectName()
+            if name.startswith(ACTION_ID_PREFIX):
+                known[name] = action
+    except (AttributeError, RuntimeError):
+        pass
+    return known
 
 def create_actions_for_scripts(scripts_folder):
     """
@@ -100,20 +276,21 @@ def create_actions_for_scripts(scripts_folder):
     # Load existing hotkeys
     hotkeys = load_hotkeys()
     
-    for filename in sorted(os.listdir(scripts_folder)):
-        if not filename.endswith(".py"):
-            continue
-            
-        script_path = os.path.join(scripts_folder, filename)
-        action_id = f"run_scriptz_{filename}"
-        action_text = f"RunScriptz: {filename}"
+    folder_prefix = os.path.join(scripts_folder, "")
+    filenames = [name for name in os.listdir(scripts_folder) if name.endswith(SCRIPT_SUFFIXES)]
+
+    for filename in sorted(filenames):
+        script_path = folder_prefix + filename
+        action_id = ACTION_ID_PREFIX + filename
+        action_text = ACTION_TEXT_PREFIX + filename
         
         # Create action
         action = RunScriptzAction(action_id, action_text, script_path)
         
         # Set shortcut if available
-        if filename in hotkeys:
-            action.setShortcut(QKeySequence(hotkeys[filename]))
+        shortcut_str = hotkeys.get(filename)
+        if shortcut_str:
+            action.setShortcut(_kseq(shortcut_str))
             action.setShortcutContext(Qt.ApplicationShortcut)
         
         actions.append(action)
@@ -131,28 +308,155 @@ def clear_existing_actions(scripts_folder):
     if not scripts_folder or not os.path.isdir(scripts_folder):
         return
     
-    for filename in os.listdir(scripts_folder):
-        if not filename.endswith(".py"):
-            continue
-            
-        action_id = f"run_scriptz_{filename}"
+    with os.scandir(scripts_folder) as it:
+        filenames = [entry.name for entry in it if entry.name.endswith(SCRIPT_SUFFIXES)]
+
+    for filename in filenames:
+        action_id = ACTION_ID_PREFIX + filename
         
         # Try to clear shortcuts without disconnecting signals
         try:
             action = app.action(action_id)
             if action:
                 action.setShortcut("")
-        except:
+        except (AttributeError, RuntimeError):
             pass
         
         try:
             action = window.action(action_id)
             if action:
                 action.setShortcut("")
-        except:
+        except (AttributeError, RuntimeError):
             pass
 
-def register_actions_with_krita(scripts_folder, retry_count=0, force_create_all=False, window=None):
+# Shortcut settings waiting to be written to Krita's settings (action_id -> shortcut)
+_pending_shortcut_settings = {}
+
+def queue_shortcut_setting(action_id, shortcut_str):
+    """
+    Queue a write of the shortcut to Krita's "Shortcuts" settings.
+    Writes are coalesced per action and flushed together, either by the next
+    register_actions_with_krita() run or on the next event loop iteration.
+    """
+    if not _pending_shortcut_settings:
+        QTimer.singleShot(0, flush_shortcut_settings)
+    _pending_shortcut_settings[action_id] = shortcut_str
+
+def flush_shortcut_settings():
+    """Write all queued shortcut settings to Krita's settings"""
+    if not _pending_shortcut_settings:
+        return
+    app = Krita.instance()
+    pending = list(_pending_shortcut_settings.items())
+    _pending_shortcut_settings.clear()
+    for action_id, shortcut_str in pending:
+        try:
+            app.writeSetting("Shortcuts", action_id, shortcut_str)
+        except Exception as e:
+            log("Warning: Could not write setting %s: %s", action_id, e)
+    log("Wrote %s shortcut settings to Krita", len(pending))
+
+# Actions already created and connected on the current main window: action_id -> QAction
+_registered_actions = {}
+_registered_window = None
+
+def _is_registered(action_id, shortcut_str):
+    """True if the action was registered and still has this shortcut"""
+    action = _registered_actions.get(action_id)
+    if action is None:
+        return False
+    try:
+        # Krita may have cleared or changed the shortcut since it was set
+        return action.shortcut() == _kseq(shortcut_str)
+    except RuntimeError:
+        # The QAction's C++ side was deleted
+        return False
+
+@contextmanager
+def _batched_updates(window):
+    """Block the main window's signals while actions are changed"""
+    qwindow = window.qwindow() if window else None
+    if qwindow is None:
+        yield
+        return
+
+    was_blocked = qwindow.blockSignals(True)
+    try:
+        yield
+    finally:
+        qwindow.blockSignals(was_blocked)
+
+def _sync_registered_window(window):
+    """Forget the registered actions when they were made for another window"""
+    global _registered_window
+    qwindow = window.qwindow()
+    if qwindow is not _registered_window:
+        _registered_actions.clear()
+        _registered_window = qwindow
+
+# Above this many scripts the Krita settings restore is run from the event loop
+_DEFER_RESTORE_THRESHOLD = 50
+
+def _deferred_restore(scripts_folder, force_create_all, window):
+    """Restore hotkeys from Krita settings and re-register if anything changed"""
+    if restore_hotkeys_from_krita_settings(scripts_folder):
+        register_actions_with_krita(scripts_folder, force_create_all=force_create_all,
+                                    window=window, restore_settings=False)
+
+def register_action_batch(window, specs):
+    """
+    Create, connect and set the shortcuts of many script actions in one go.
+    specs is a list of (action_id, action_text, script_path, shortcut_str)
+    tuples, shortcut_str being "" for no shortcut. Actions are created and
+    connected first, shortcuts are then set together so the window's shortcut
+    map isn't invalidated between every createAction call. Signals of the
+    window are blocked meanwhile. Returns the number of actions registered.
+    """
+    _sync_registered_window(window)
+    if not specs:
+        return 0
+    created = []
+    with _batched_updates(window):
+        for action_id, action_text, script_path, shortcut_str in specs:
+            try:
+                # Always try to create the action - Krita will handle duplicates
+                action = window.createAction(action_id, action_text, "tools/scripts")
+
+                if action:
+                    log("Created action: %s", action_id)
+
+                    # Route the trigger through the dispatcher, keyed by action id
+                    connect_script_action(action, action_id, script_path)
+                    log("Connected action to script: %s", script_path)
+                    created.append((action_id, action, shortcut_str))
+                else:
+                    log("Failed to create action: %s", action_id)
+
+            except Exception as e:
+                log("Error registering action %s: %s", action_id, e)
+
+        for action_id, action, shortcut_str in created:
+            try:
+                # Set shortcut if available - this will be saved by Krita
+                if shortcut_str:
+                    action.setShortcut(_kseq(shortcut_str))
+                    action.setShortcutContext(Qt.ApplicationShortcut)
+                    action.setAutoRepeat(False)
+                    log("Set shortcut for %s: %s", action_id, shortcut_str)
+
+                    # Force Krita to recognize and save the shortcut (written with the next flush)
+                    queue_shortcut_setting(action_id, shortcut_str)
+                else:
+                    log("No hotkey assigned for: %s", action_id)
+
+                _registered_actions[action_id] = action
+            except Exception as e:
+                log("Error setting shortcut for %s: %s", action_id, e)
+
+    return len(created)
+
+def register_actions_with_krita(scripts_folder, retry_count=0, force_create_all=False, window=None,
+                                restore_settings=True, force=False):
     """
     Register all script actions with Krita's action system.
     This makes them appear in the keyboard shortcuts menu and persists shortcuts.
@@ -162,11 +466,18 @@ def register_actions_with_krita(scripts_folder, retry_count=0, force_create_all=
         retry_count: Number of retry attempts
         force_create_all: If True, create actions for ALL scripts, not just those with hotkeys
         window: Explicit window instance to use (optional)
+        restore_settings: If True, first restore hotkeys saved in Krita's settings
+        force: If True, re-apply every shortcut even if it was already registered
+               (Krita may have cleared it since)
+
+    Returns:
+        True if the actions were registered, False if registration was skipped
+        or only scheduled for a retry
     """
     app = Krita.instance()
     if not app:
-        print("[RunScriptz] No Krita instance found")
-        return
+        log("No Krita instance found")
+        return False
 
     # Use provided window or try to find active window
     if not window:
@@ -174,83 +485,69 @@ def register_actions_with_krita(scripts_folder, retry_count=0, force_create_all=
 
     if not window and retry_count < 5:
         # If no window is available, try again after a short delay
-        print(f"[RunScriptz] No active window found, retrying in 2 seconds... (attempt {retry_count + 1}/5)")
-        QTimer.singleShot(2000, lambda: register_actions_with_krita(scripts_folder, retry_count + 1, force_create_all))
-        return
+        log("No active window found, retrying in 2 seconds... (attempt %s/5)", retry_count + 1)
+        QTimer.singleShot(2000, partial(register_actions_with_krita, scripts_folder, retry_count + 1,
+                                              force_create_all, force=force))
+        return False
 
     if not window:
-        print("[RunScriptz] No active window found after retries, skipping registration")
-        return
+        log("No active window found after retries, skipping registration")
+        return False
 
-    if not scripts_folder or not os.path.isdir(scripts_folder):
-        print("[RunScriptz] Invalid scripts folder")
-        return
+    folder_stat = _dir_stat(scripts_folder)
+    if not folder_stat:
+        log("Invalid scripts folder")
+        return False
 
-    print(f"[RunScriptz] Registering actions for scripts in: {scripts_folder}")
+    log("Registering actions for scripts in: %s", scripts_folder)
 
-    # First, try to restore hotkeys from Krita's settings
-    restore_hotkeys_from_krita_settings(scripts_folder)
+    # First, try to restore hotkeys from Krita's settings. That is one
+    # readSetting per script, so for big folders do it once the UI is idle.
+    if restore_settings:
+        if len(get_all_scripts_cached(scripts_folder, folder_stat)) > _DEFER_RESTORE_THRESHOLD:
+            QTimer.singleShot(0, partial(_deferred_restore, scripts_folder, force_create_all, window))
+        else:
+            restore_hotkeys_from_krita_settings(scripts_folder)
 
     # Load existing hotkeys (now potentially updated from Krita settings)
     hotkeys = load_hotkeys()
 
-    # Register each script as a persistent action
-    for script_key, script_path in get_all_scripts(scripts_folder):
-        
-        action_id = get_action_id_for_key(script_key)
-        action_text = f"RunScriptz: {script_key}"
-
-        # Only create actions for scripts with hotkeys, unless force_create_all is True
-        if not force_create_all and script_key not in hotkeys:
-            continue
-
-        try:
-            # Always try to create the action - Krita will handle duplicates
-            action = window.createAction(action_id, action_text, "tools/scripts")
-
-            if action:
-                print(f"[RunScriptz] Created action: {action_id}")
+    if force_create_all:
+        scripts = get_all_scripts_cached(scripts_folder, folder_stat)
+    else:
+        # Only scripts with hotkeys get an action, so resolve just those
+        path_index = dict(get_all_scripts_cached(scripts_folder, folder_stat))
+        scripts = [(script_key, path_index[script_key]) for script_key in hotkeys
+                   if script_key in path_index]
 
-                # CRITICAL FIX: Create a proper closure to capture the script_path
-                def create_script_runner(path):
-                    return lambda: run_script_from_path(path)
+    _sync_registered_window(window)
 
-                # Set up the triggered connection with proper closure
-                action.triggered.connect(create_script_runner(script_path))
-                print(f"[RunScriptz] Connected action to script: {script_path}")
+    # Register each script as a persistent action, skipping the ones still
+    # wired up with this shortcut unless this is a forced re-sync
+    specs = []
+    for script_key, script_path in scripts:
+        action_id = get_action_id_for_key(script_key)
+        shortcut_str = hotkeys.get(script_key, "")
+        if not force and _is_registered(action_id, shortcut_str):
+            continue
+        specs.append((action_id, ACTION_TEXT_PREFIX + script_key, script_path, shortcut_str))
 
-                # Set shortcut if available - this will be saved by Krita
-                if script_key in hotkeys:
-                    shortcut_str = hotkeys[script_key]
-                    shortcut = QKeySequence(shortcut_str)
-                    action.setShortcut(shortcut)
-                    action.setShortcutContext(Qt.ApplicationShortcut)
-                    print(f"[RunScriptz] Set shortcut for {script_key}: {shortcut_str}")
-
-                    # Force Krita to recognize and save the shortcut
-                    try:
-                        # Write directly to Krita's settings
-                        app.writeSetting("Shortcuts", action_id, shortcut_str)
-                        print(f"[RunScriptz] Forced write to Krita settings: {action_id} = {shortcut_str}")
-                    except Exception as e:
-                        print(f"[RunScriptz] Warning: Could not write setting: {e}")
-                else:
-                    print(f"[RunScriptz] No hotkey assigned for: {script_key}")
-            else:
-                print(f"[RunScriptz] Failed to create action: {action_id}")
+    register_action_batch(window, specs)
 
-        except Exception as e:
-            print(f"[RunScriptz] Error registering action for {script_key}: {e}")
+    log("Finished registering actions")
 
-    print(f"[RunScriptz] Finished registering actions")
+    # Write all shortcuts to Krita's settings in one batch
+    flush_shortcut_settings()
 
     # Force Krita to save the current shortcut configuration
     try:
         # This triggers Krita to save shortcuts to its configuration
         app.writeSetting("", "runscriptz_last_registration", str(len(hotkeys)))
-        print("[RunScriptz] Triggered Krita settings save")
+        log("Triggered Krita settings save")
     except Exception as e:
-        print(f"[RunScriptz] Could not trigger settings save: {e}")
+        log("Could not trigger settings save: %s", e)
+
+    return True
 
 def enforce_hotkeys(window=None):
     """
@@ -269,124 +566,121 @@ def enforce_hotkeys(window=None):
     if not hotkeys:
         return
 
-    print(f"[RunScriptz] Enforcing hotkeys for {len(hotkeys)} scripts...")
+    log("Enforcing hotkeys for %s scripts...", len(hotkeys))
     
     fixed_count = 0
     app = Krita.instance() # For writeSetting
+    known = get_known_actions()
 
     for script_key, shortcut_str in hotkeys.items():
         action_id = get_action_id_for_key(script_key)
         
-        # Try to find the action
-        action = None
-        try:
-            # Try window first
-            action = window.action(action_id)
-        except:
-            pass
-            
+        # Try to find the action, application level first
+        action = known.get(action_id)
         if not action:
             try:
-                # Try application level
-                action = app.action(action_id)
-            except:
+                # Then the window
+                action = window.action(action_id)
+            except (AttributeError, RuntimeError):
                 pass
         
         if action:
             current_shortcut = action.shortcut().toString()
             # If shortcut is missing or different, fix it
             if current_shortcut != shortcut_str:
-                print(f"[RunScriptz] Fix: Action {action_id} lost shortcut (has '{current_shortcut}', wants '{shortcut_str}'). Re-applying.")
+                log("Fix: Action %s lost shortcut (has '%s', wants '%s'). Re-applying.", action_id, current_shortcut, shortcut_str)
                 
-                shortcut = QKeySequence(shortcut_str)
+                shortcut = _kseq(shortcut_str)
                 action.setShortcut(shortcut)
                 action.setShortcutContext(Qt.ApplicationShortcut)
                 
                 # Re-force Krita setting
                 try:
                     app.writeSetting("Shortcuts", action_id, shortcut_str)
-                except:
+                except RuntimeError:
                     pass
                     
                 fixed_count += 1
 
     if fixed_count > 0:
-        print(f"[RunScriptz] Enforcer fixed {fixed_count} broken shortcuts.")
+        log("Enforcer fixed %s broken shortcuts.", fixed_count)
     else:
-        print("[RunScriptz] Enforcer found all shortcuts correct.")
+        log("Enforcer found all shortcuts correct.")
 
 def ensure_actions_exist_on_startup(window=None):
     """
     Ensure all script actions with hotkeys exist when Krita starts.
     This should be called as early as possible in the plugin lifecycle.
     """
-    print("[RunScriptz] === ENSURING ACTIONS EXIST ON STARTUP ===")
+    log("=== ENSURING ACTIONS EXIST ON STARTUP ===")
 
     app = Krita.instance()
     if not app:
-        print("[RunScriptz] ERROR: No Krita instance found!")
+        log("ERROR: No Krita instance found!")
         return
 
     # Use provided window or try to find active window
     if not window:
         window = app.activeWindow()
         
-    print(f"[RunScriptz] Active window available: {window is not None}")
+    log("Active window available: %s", window is not None)
 
     # Load config to get scripts folder
     try:
-        config_file = os.path.join(
-            app.getAppDataLocation() or os.path.expanduser("~"),
-            "run_scriptz_config.json"
-        )
+        config_file = get_config_file()
 
-        print(f"[RunScriptz] Looking for config file: {config_file}")
-        print(f"[RunScriptz] Config file exists: {os.path.exists(config_file)}")
+        log("Looking for config file: %s", config_file)
 
-        if os.path.exists(config_file):
-            with open(config_file, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
-                scripts_folder = cfg.get("scripts_folder", "")
+        try:
+            cfg = load_json_cached(config_file)
+        except FileNotFoundError:
+            cfg = None
+
+        if cfg is not None:
+            scripts_folder = cfg.get("scripts_folder", "")
+            folder_ok = _dir_stat(scripts_folder) is not None
 
-            print(f"[RunScriptz] Scripts folder from config: {scripts_folder}")
-            print(f"[RunScriptz] Scripts folder exists: {os.path.isdir(scripts_folder) if scripts_folder else False}")
+            log("Scripts folder from config: %s", scripts_folder)
+            log("Scripts folder exists: %s", folder_ok)
 
-            if scripts_folder and os.path.isdir(scripts_folder):
+            if folder_ok:
                 # Load hotkeys to see what we need to create
                 hotkeys = load_hotkeys()
-                print(f"[RunScriptz] Found {len(hotkeys)} hotkeys in JSON file:")
-                for script, key in hotkeys.items():
-                    print(f"[RunScriptz]   {script} -> {key}")
+                log("Found %s hotkeys in JSON file:", len(hotkeys))
+                if DEBUG:
+                    for script, key in hotkeys.items():
+                        log("  %s -> %s", script, key)
 
                 if hotkeys:
-                    print(f"[RunScriptz] calling register_actions_with_krita...")
-                    # Register actions for scripts that have hotkeys
-                    register_actions_with_krita(scripts_folder, force_create_all=False, window=window)
+                    log("scheduling register_actions_with_krita...")
+                    # Register actions for scripts that have hotkeys once the
+                    # current event loop iteration is done, so Krita stays responsive
+                    QTimer.singleShot(0, partial(register_actions_with_krita,
+                                                 scripts_folder, force_create_all=False, window=window))
                 else:
-                    print("[RunScriptz] No hotkeys found, nothing to register")
+                    log("No hotkeys found, nothing to register")
             else:
-                print("[RunScriptz] No valid scripts folder found")
+                log("No valid scripts folder found")
         else:
-            print("[RunScriptz] No config file found")
+            log("No config file found")
 
     except Exception as e:
-        print(f"[RunScriptz] ERROR in ensure_actions_exist_on_startup: {e}")
-        import traceback
+        log("ERROR in ensure_actions_exist_on_startup: %s", e)
         traceback.print_exc()
 
-    print("[RunScriptz] === END ENSURING ACTIONS ===")
+    log("=== END ENSURING ACTIONS ===")
 
 def create_single_action_with_hotkey(scripts_folder, script_name, hotkey):
     """
     Create a single action with hotkey - for immediate creation
     """
-    print(f"[RunScriptz] Creating single action: {script_name} -> {hotkey}")
+    log("Creating single action: %s -> %s", script_name, hotkey)
 
     app = Krita.instance()
     window = app.activeWindow()
 
     if not window:
-        print("[RunScriptz] No window available for single action creation")
+        log("No window available for single action creation")
         return False
 
     script_path = os.path.join(scripts_folder, script_name)
@@ -398,26 +692,23 @@ def create_single_action_with_hotkey(scripts_folder, script_name, hotkey):
         action = window.createAction(action_id, action_text, "tools/scripts")
 
         if action:
-            # Connect to script execution with proper closure
-            def create_script_runner(path):
-                return lambda: run_script_from_path(path)
-
-            action.triggered.connect(create_script_runner(script_path))
+            # Connect to script execution
+            connect_script_action(action, action_id, script_path)
 
             # Set the shortcut
-            shortcut = QKeySequence(hotkey)
+            shortcut = _kseq(hotkey)
             action.setShortcut(shortcut)
             action.setShortcutContext(Qt.ApplicationShortcut)
             action.setAutoRepeat(False)
 
-            print(f"[RunScriptz] Successfully created single action: {action_id} with hotkey {hotkey}")
+            log("Successfully created single action: %s with hotkey %s", action_id, hotkey)
             return True
         else:
-            print(f"[RunScriptz] Failed to create single action: {action_id}")
+            log("Failed to create single action: %s", action_id)
             return False
 
     except Exception as e:
-        print(f"[RunScriptz] Error creating single action: {e}")
+        log("Error creating single action: %s", e)
         return False
 
 def register_at_app_level(app, scripts_folder):
@@ -425,44 +716,59 @@ def register_at_app_level(app, scripts_folder):
     if not scripts_folder or not os.path.isdir(scripts_folder):
         return
 
-    print(f"[RunScriptz] Attempting app-level registration for: {scripts_folder}")
+    log("Attempting app-level registration for: %s", scripts_folder)
     hotkeys = load_hotkeys()
 
-    for filename in sorted(os.listdir(scripts_folder)):
-        if not filename.endswith(".py"):
-            continue
+    with os.scandir(scripts_folder) as it:
+        entries = [entry for entry in it if entry.name.endswith(SCRIPT_SUFFIXES)]
 
-        script_path = os.path.join(scripts_folder, filename)
-        action_id = f"run_scriptz_{filename}"
-        action_text = f"RunScriptz: {filename}"
+    for entry in sorted(entries, key=attrgetter("name")):
+        filename = entry.name
+        script_path = entry.path
+        action_id = ACTION_ID_PREFIX + filename
+        action_text = ACTION_TEXT_PREFIX + filename
 
         try:
             # Try to create action at application level
             action = app.createAction(action_id, action_text)
             if action:
                 # Set up the triggered connection
-                action.triggered.connect(lambda: run_script_from_path(script_path))
+                connect_script_action(action, action_id, script_path)
 
                 # Set shortcut if available
-                if filename in hotkeys:
-                    action.setShortcut(QKeySequence(hotkeys[filename]))
+                shortcut_str = hotkeys.get(filename)
+                if shortcut_str:
+                    action.setShortcut(_kseq(shortcut_str))
                     action.setShortcutContext(Qt.ApplicationShortcut)
-                    print(f"[RunScriptz] App-level action created with hotkey: {filename} -> {hotkeys[filename]}")
+                    log("App-level action created with hotkey: %s -> %s", filename, shortcut_str)
                 else:
-                    print(f"[RunScriptz] App-level action created: {filename}")
+                    log("App-level action created: %s", filename)
         except Exception as e:
-            print(f"[RunScriptz] Failed to create app-level action for {filename}: {e}")
+            log("Failed to create app-level action for %s: %s", filename, e)
+
+# Script path run by each connected action: action_id -> script_path
+_action_paths = {}
+
+def _dispatch(action_id, checked=False):
+    """Run the script currently mapped to action_id"""
+    script_path = _action_paths.get(action_id)
+    if script_path:
+        run_script_from_path(script_path)
+
+def connect_script_action(action, action_id, script_path):
+    """Make triggering action run script_path"""
+    _action_paths[action_id] = script_path
+    action.triggered.connect(partial(_dispatch, action_id))
 
 # Global variable to track last execution time
-_last_execution_time = 0
+_last_execution_time = float("-inf")
 
 def run_script_from_path(script_path):
     """Execute a script from the given path"""
     global _last_execution_time
     
     # Prevent rapid multiple executions (debounce)
-    import time
-    current_time = time.time()
+    current_time = time.monotonic()
     if current_time - _last_execution_time < 0.5:  # 500ms debounce
         return
     _last_execution_time = current_time
@@ -471,61 +777,122 @@ def run_script_from_path(script_path):
         return
     
     try:
-        import importlib.util
-        spec = importlib.util.spec_from_file_location("run_scriptz_external", script_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        
+        namespace = exec_script(script_path)
+
         # Try to call main() function if it exists
-        if hasattr(module, "main"):
-            module.main()
+        main = namespace.get("main")
+        if callable(main):
+            main()
     except Exception as e:
         pass
 
+# path -> (mtime_ns, size, parsed JSON), reused until the file changes on disk
+_json_cache = {}
+
+def load_json_cached(path):
+    """
+    Parse a JSON file, reusing the last result while its mtime and size are
+    unchanged. The returned object is shared, copy it before modifying.
+    Raises OSError if the file can't be read and ValueError if it isn't JSON.
+    """
+    st = os.stat(path)
+    cached = _json_cache.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    with open(path, "rb") as f:
+        data = _loads(f.read())
+    _json_cache[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
 def load_hotkeys():
-    """Load hotkey configuration from file"""
+    """
+    Load hotkey configuration from file.
+    The parsed file is cached until it changes on disk; every caller gets
+    its own copy of the dict so it can be modified freely.
+    """
     try:
-        if os.path.exists(HOTKEY_FILE):
-            with open(HOTKEY_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-    except Exception as e:
+        return dict(load_json_cached(get_hotkey_file()))
+    except (OSError, ValueError, TypeError):
         pass
     return {}
 
+# path -> (blake2b digest, mtime_ns) of the last JSON we wrote there
+_written_digests = {}
+# Directories write_json_file() already created or found
+_ensured_dirs = set()
+
+def write_json_file(path, data):
+    """
+    Write data as JSON to path, atomically through a temporary file.
+    Skipped when the content matches our last write and the file wasn't
+    touched since. Returns True if the file was written; raises OSError
+    or TypeError like a plain write would.
+    """
+    new_bytes = _dumps(data)
+    digest = hashlib.blake2b(new_bytes, digest_size=16).digest()
+    last = _written_digests.get(path)
+    if last and last[0] == digest:
+        try:
+            if os.stat(path).st_mtime_ns == last[1]:
+                return False
+        except OSError:
+            pass
+
+    # makedirs() stats every path component, once per directory is enough
+    directory = os.path.dirname(path)
+    if directory not in _ensured_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _ensured_dirs.add(directory)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(new_bytes)
+        f.flush()
+        os.fsync(f.fileno())
+    # Readers see either the old or the new file, never a partial one
+    os.replace(tmp_path, path)
+    _written_digests[path] = (digest, os.stat(path).st_mtime_ns)
+    # Parsed content of the old file is stale now
+    _json_cache.pop(path, None)
+    return True
+
 def save_hotkeys(hotkeys):
     """Save hotkey configuration to file"""
     try:
-        os.makedirs(os.path.dirname(HOTKEY_FILE), exist_ok=True)
-        with open(HOTKEY_FILE, "w", encoding="utf-8") as f:
-            json.dump(hotkeys, f, indent=2)
-    except Exception as e:
+        hotkey_file = get_hotkey_file()
+        write_json_file(hotkey_file, hotkeys)
+        # Keep the cache in sync so the next load_hotkeys() does not re-read the file
+        st = os.stat(hotkey_file)
+        _json_cache[hotkey_file] = (st.st_mtime_ns, st.st_size, dict(hotkeys))
+    except (OSError, TypeError):
         pass
 
 def assign_hotkey_to_script(script_name, key_sequence, script_path=None):
     """Assign a hotkey to a specific script and ensure it persists in Krita"""
-    print(f"[RunScriptz] Assigning hotkey '{key_sequence}' to '{script_name}'")
+    log("Assigning hotkey '%s' to '%s'", key_sequence, script_name)
 
     # Test the key sequence first
     try:
-        test_seq = QKeySequence(key_sequence)
+        test_seq = _kseq(key_sequence)
         if test_seq.isEmpty():
-            print(f"[RunScriptz] Invalid key sequence: '{key_sequence}'")
+            log("Invalid key sequence: '%s'", key_sequence)
             return False
     except Exception as e:
-        print(f"[RunScriptz] Error parsing key sequence: {e}")
+        log("Error parsing key sequence: %s", e)
         return False
 
     # Save to our hotkey file
     hotkeys = load_hotkeys()
     hotkeys[script_name] = key_sequence
     save_hotkeys(hotkeys)
-    print(f"[RunScriptz] Saved hotkey to config file")
+    invalidate_scripts_cache()
+    log("Saved hotkey to config file")
 
     # Get Krita instances
     app = Krita.instance()
     window = app.activeWindow()
     if not window:
-        print("[RunScriptz] No active window for hotkey assignment")
+        log("No active window for hotkey assignment")
         return False
 
     action_id = get_action_id_for_key(script_name)
@@ -536,50 +903,57 @@ def assign_hotkey_to_script(script_name, key_sequence, script_path=None):
         action = window.createAction(action_id, f"RunScriptz: {script_name}", "tools/scripts")
 
         if action:
-            print(f"[RunScriptz] Created/updated action: {action_id}")
+            log("Created/updated action: %s", action_id)
 
-            # Connect the script execution with proper closure
+            # Connect the script execution
+            connected = False
             if script_path and os.path.exists(script_path):
-                def create_script_runner(path):
-                    return lambda: run_script_from_path(path)
-
-                action.triggered.connect(create_script_runner(script_path))
-                print(f"[RunScriptz] Connected action to script: {script_path}")
+                connect_script_action(action, action_id, script_path)
+                connected = True
+                log("Connected action to script: %s", script_path)
 
             # Set the shortcut
-            shortcut = QKeySequence(key_sequence)
+            shortcut = _kseq(key_sequence)
             action.setShortcut(shortcut)
             action.setShortcutContext(Qt.ApplicationShortcut)
             action.setAutoRepeat(False)
 
-            print(f"[RunScriptz] Set shortcut: {key_sequence}")
+            log("Set shortcut: %s", key_sequence)
 
-            # CRITICAL: Write to Krita's kritarc file directly
-            try:
-                # This writes to Krita's main configuration file
-                app.writeSetting("Shortcuts", action_id, key_sequence)
-                print(f"[RunScriptz] Saved shortcut to Krita's kritarc: {action_id} = {key_sequence}")
-            except Exception as e:
-                print(f"[RunScriptz] Could not save to kritarc: {e}")
+            # CRITICAL: Write to Krita's kritarc file. Queued so it is coalesced
+            # with the register_actions_with_krita() pass that usually follows.
+            queue_shortcut_setting(action_id, key_sequence)
+            log("Queued shortcut for Krita's kritarc: %s = %s", action_id, key_sequence)
+
+            # Let the next register_actions_with_krita() pass skip this action
+            _sync_registered_window(window)
+            if connected:
+                _registered_actions[action_id] = action
+            else:
+                _registered_actions.pop(action_id, None)
 
             return True
         else:
-            print(f"[RunScriptz] Failed to create action")
+            log("Failed to create action")
             return False
 
     except Exception as e:
-        print(f"[RunScriptz] Error creating action: {e}")
+        log("Error creating action: %s", e)
         return False
 
 def remove_hotkey_from_script(script_name):
     """Remove hotkey from a specific script"""
-    print(f"[RunScriptz] Removing hotkey from '{script_name}'")
+    log("Removing hotkey from '%s'", script_name)
 
     hotkeys = load_hotkeys()
     if script_name in hotkeys:
         del hotkeys[script_name]
         save_hotkeys(hotkeys)
-        print(f"[RunScriptz] Removed hotkey from config file")
+        invalidate_scripts_cache()
+        log("Removed hotkey from config file")
+
+        action_id = get_action_id_for_key(script_name)
+        _registered_actions.pop(action_id, None)
 
         # Update the action if it exists
         app = Krita.instance()
@@ -587,39 +961,52 @@ def remove_hotkey_from_script(script_name):
         if not window:
             return
 
-        action_id = get_action_id_for_key(script_name)
-
         # Try to find and update the action
         try:
             action = window.action(action_id)
             if action:
                 action.setShortcut("")
-                print(f"[RunScriptz] Cleared shortcut from action")
+                log("Cleared shortcut from action")
 
                 # Remove from Krita settings
-                try:
-                    app.writeSetting("Shortcuts", action_id, "")
-                    print(f"[RunScriptz] Cleared shortcut from Krita kritarc")
-                except Exception as e:
-                    print(f"[RunScriptz] Could not clear Krita setting: {e}")
+                queue_shortcut_setting(action_id, "")
+                log("Queued clearing shortcut from Krita kritarc")
         except Exception as e:
-            print(f"[RunScriptz] Error updating action: {e}")
+            log("Error updating action: %s", e)
 
 def restore_hotkeys_from_krita_settings(scripts_folder):
-    """Restore hotkeys from Krita's own settings system"""
+    """
+    Restore hotkeys from Krita's own settings system.
+    Only needed when our hotkey file is missing or empty (first run/recovery),
+    otherwise the file is up to date and the per-script lookups are skipped.
+    """
+    try:
+        if os.stat(get_hotkey_file()).st_size > 2:  # more than "{}"
+            return False
+    except OSError:
+        pass
+
     if not scripts_folder or not os.path.isdir(scripts_folder):
         return
 
-    print("[RunScriptz] Attempting to restore hotkeys from Krita settings...")
+    log("Attempting to restore hotkeys from Krita settings...")
     app = Krita.instance()
     if not app:
         return
 
+    # Queued writes (e.g. a removed hotkey's clear) must land before the
+    # settings are read back, or the old shortcut would be restored
+    flush_shortcut_settings()
+
     hotkeys = load_hotkeys()
     restored_count = 0
 
-    for script_key, script_path in get_all_scripts(scripts_folder):
-        
+    for script_key, script_path in get_all_scripts_cached(scripts_folder):
+        # Scripts already in the JSON file are authoritative (we write them
+        # to Krita's settings ourselves), only look up the missing ones
+        if script_key in hotkeys:
+            continue
+
         action_id = get_action_id_for_key(script_key)
         try:
             # Check if Krita has a saved shortcut for this script in the Shortcuts section
@@ -627,16 +1014,16 @@ def restore_hotkeys_from_krita_settings(scripts_folder):
             if saved_shortcut and saved_shortcut != "":
                 hotkeys[script_key] = saved_shortcut
                 restored_count += 1
-                print(f"[RunScriptz] Restored hotkey from Krita kritarc: {script_key} -> {saved_shortcut}")
+                log("Restored hotkey from Krita kritarc: %s -> %s", script_key, saved_shortcut)
         except Exception as e:
-            print(f"[RunScriptz] Error reading Krita shortcut setting for {script_key}: {e}")
+            log("Error reading Krita shortcut setting for %s: %s", script_key, e)
 
     if restored_count > 0:
         save_hotkeys(hotkeys)
-        print(f"[RunScriptz] Restored {restored_count} hotkeys from Krita settings")
+        log("Restored %s hotkeys from Krita settings", restored_count)
         return True
     else:
-        print("[RunScriptz] No hotkeys found in Krita settings")
+        log("No hotkeys found in Krita settings")
         return False
 
 def debug_krita_shortcuts():
@@ -645,8 +1032,8 @@ def debug_krita_shortcuts():
     if not app:
         return "[RunScriptz] No Krita instance for debug\n"
 
-    log = []
-    log.append("[RunScriptz] === DEBUG: Krita Shortcuts ===")
+    lines = []
+    lines.append("[RunScriptz] === DEBUG: Krita Shortcuts ===")
 
     # Try to read some known shortcuts to see the format
     try:
@@ -659,24 +1046,24 @@ def debug_krita_shortcuts():
             try:
                 value = app.readSetting("Shortcuts", shortcut_name, "NOT_FOUND")
                 if value != "NOT_FOUND":
-                    log.append(f"[RunScriptz] Found shortcut: {shortcut_name} = {value}")
+                    lines.append(f"[RunScriptz] Found shortcut: {shortcut_name} = {value}")
                     break
             except:
                 pass
 
         # Check our own shortcuts
-        log.append("[RunScriptz] Checking RunScriptz shortcuts:")
+        lines.append("[RunScriptz] Checking RunScriptz shortcuts:")
         for i in range(5):  # Check a few potential script names
             action_id = f"run_scriptz_test_script_{i}.py"
             try:
                 value = app.readSetting("Shortcuts", action_id, "")
                 if value:
-                    log.append(f"[RunScriptz] Found our shortcut: {action_id} = {value}")
+                    lines.append(f"[RunScriptz] Found our shortcut: {action_id} = {value}")
             except Exception as e:
-                log.append(f"[RunScriptz] Error reading {action_id}: {e}")
+                lines.append(f"[RunScriptz] Error reading {action_id}: {e}")
 
     except Exception as e:
-        log.append(f"[RunScriptz] Debug error: {e}")
+        lines.append(f"[RunScriptz] Debug error: {e}")
 
-    log.append("[RunScriptz] === END DEBUG ===")
-    return "\n".join(log)
+    lines.append("[RunScriptz] === END DEBUG ===")
+    return "\n".join(lines)
@@ -1,29 +1,69 @@
 from krita import Krita, Extension, DockWidget, DockWidgetFactory, DockWidgetFactoryBase
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog,
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog,
-    QListWidget, QListWidgetItem, QShortcut, QDialog, QLineEdit, QLabel, QDialogButtonBox, QMenu,
-    QScrollArea, QGridLayout, QFrame, QMessageBox, QTextEdit, QApplication,
-    QTreeWidget, QTreeWidgetItem, QSizePolicy
+    QShortcut, QDialog, QLineEdit, QLabel, QDialogButtonBox, QMenu,
+    QScrollArea, QMessageBox, QTextEdit, QApplication,
+    QTreeWidget, QTreeWidgetItem, QSizePolicy, QDockWidget
 )
-from PyQt5.QtGui import QKeySequence, QIcon, QKeyEvent
-from PyQt5.QtCore import Qt, QTimer, QObject, QEvent
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtCore import Qt, QTimer, QObject, QEvent, QRunnable, QThreadPool, pyqtSignal
 import os
-import importlib.util
-import json
-import subprocess
+import weakref
+from functools import partial
 from . import actions
 
-CONFIG_FILE = os.path.join(
-    Krita.instance().getAppDataLocation() or os.path.expanduser("~"),
-    "run_scriptz_config.json"
-)
+# The key event filter is a debugging fallback, script hotkeys normally go
+# through Krita's actions. Set RUNSCRIPTZ_EVENT_FILTER=1 to install it.
+_USE_EVENT_FILTER = os.environ.get("RUNSCRIPTZ_EVENT_FILTER") == "1"
+
+
+def get_scripts_folder():
+    """The scripts folder from the config file, "" if none is set or it can't be read"""
+    try:
+        return actions.load_json_cached(actions.get_config_file()).get("scripts_folder", "")
+    except Exception:
+        return ""
 
-HOTKEY_FILE = os.path.join(
-    Krita.instance().getAppDataLocation() or os.path.expanduser("~"),
-    "run_scriptz_hotkeys.json"
+
+# Keys that only act as modifiers, never a hotkey on their own
+_MOD_KEYS = frozenset((Qt.Key_Control, Qt.Key_Shift, Qt.Key_Alt, Qt.Key_Meta))
+
+# Key code of the docker toggle shortcut, Ctrl+Shift+D
+_TOGGLE_DOCKER_CODE = int(Qt.ControlModifier | Qt.ShiftModifier) | Qt.Key_D
+# Stands in for a script name in the filter's key code table
+_TOGGLE_DOCKER = object()
+
+# Modifier names in the order QKeySequence.toString() writes them, e.g. "Meta+Ctrl+Alt+Shift+X"
+_MOD_NAMES = (
+    (Qt.MetaModifier, "Meta"),
+    (Qt.ControlModifier, "Ctrl"),
+    (Qt.AltModifier, "Alt"),
+    (Qt.ShiftModifier, "Shift"),
+    (Qt.KeypadModifier, "Num"),
 )
 
+# key code -> QKeySequence(key).toString()
+_KEY_NAME_CACHE = {}
+
+
+def _format_combo(mods, key):
+    """Format a modifiers + key press like "Ctrl+Shift+A", "" if Qt has no name for the key"""
+    key_name = _KEY_NAME_CACHE.get(key)
+    if key_name is None:
+        key_name = _KEY_NAME_CACHE[key] = QKeySequence(key).toString()
+    if not key_name:
+        return ""
+    parts = [name for bit, name in _MOD_NAMES if mods & bit]
+    parts.append(key_name)
+    return "+".join(parts)
+
+
+def _find_dock():
+    """The RunScriptz dock of the active window, looked up in Qt's object tree"""
+    window = Krita.instance().activeWindow()
+    qwindow = window.qwindow() if window else None
+    return qwindow.findChild(QDockWidget, "RunScriptz") if qwindow else None
+
 
 class HotkeyDialog(QDialog):
     """Dialog to capture a key combination"""
@@ -48,30 +88,11 @@ class HotkeyDialog(QDialog):
 
     def keyPressEvent(self, event):
         # Ignore modifier keys alone
-        if event.key() in (Qt.Key_Control, Qt.Key_Shift, Qt.Key_Alt, Qt.Key_Meta):
+        if event.key() in _MOD_KEYS:
             event.accept()
             return
             
-        # Use QKeySequence to properly format the key combination
-        key_seq = QKeySequence(event.modifiers() | event.key())
-        full_seq = key_seq.toString()
-        
-        # Handle special cases for better compatibility
-        if full_seq == "":
-            # Fallback to manual formatting for special keys
-            modifiers = []
-            if event.modifiers() & Qt.ControlModifier:
-                modifiers.append("Ctrl")
-            if event.modifiers() & Qt.AltModifier:
-                modifiers.append("Alt")
-            if event.modifiers() & Qt.ShiftModifier:
-                modifiers.append("Shift")
-            if event.modifiers() & Qt.MetaModifier:
-                modifiers.append("Meta")
-            
-            key_name = QKeySequence(event.key()).toString()
-            if key_name:
-                full_seq = "+".join(modifiers + [key_name])
+        full_seq = _format_combo(event.modifiers(), event.key())
         
         if full_seq:
             self.line_edit.setText(full_seq)
@@ -87,87 +108,157 @@ class RunScriptzShortcutFilter(QObject):
     Event filter to catch hotkeys globally on the main window.
     This bypasses Krita's action shortcut system which can be unreliable.
     """
+    _KP = int(QEvent.KeyPress)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.hotkeys = {}
+        self._hotkey_codes = {}
+        self._scripts_folder = ""
+        self._dock_ref = None
         self.load_hotkeys()
-        
+
     def load_hotkeys(self):
+        """Reload hotkeys and scripts folder and rebuild the key code -> script index"""
         self.hotkeys = actions.load_hotkeys()
-        
+        self._scripts_folder = get_scripts_folder()
+        # Parse each shortcut once so keypresses compare ints, whatever order
+        # the modifiers were written in ("Shift+Ctrl+D" == "Ctrl+Shift+D")
+        # The docker toggle goes in the same table so a keypress is a single lookup
+        self._hotkey_codes = {_TOGGLE_DOCKER_CODE: _TOGGLE_DOCKER}
+        for script_name, shortcut_str in self.hotkeys.items():
+            seq = QKeySequence(shortcut_str)
+            # A single keypress can only match a one-chord sequence
+            if seq.count() != 1:
+                continue
+            # First script wins when several share a shortcut
+            self._hotkey_codes.setdefault(int(seq[0]), script_name)
+
     def eventFilter(self, obj, event):
-        if event.type() == QEvent.KeyPress:
-            # Create a key sequence from the event
-            key = event.key()
-            modifiers = event.modifiers()
-            
-            # Ignore modifier-only presses
-            if key in (Qt.Key_Control, Qt.Key_Shift, Qt.Key_Alt, Qt.Key_Meta):
-                return False
-
-            # Use QKeySequence to generate a standard string representation
-            # We combine modifiers and key to get "Ctrl+Shift+A" style string
-            seq = QKeySequence(modifiers | key)
-            seq_str = seq.toString()
-            
-            # print(f"[RunScriptz] Key Pressed: {seq_str}") # Uncomment for verbose heavy debugging
-            
-            # Check for docker toggle shortcut (Ctrl+Shift+D)
-            if seq_str == "Ctrl+Shift+D":
-                print(f"[RunScriptz] Docker toggle shortcut pressed: {seq_str}")
-                self.toggle_docker()
-                return True  # Consume event
-            
-            # Check for matches in our hotkeys
-            for script_name, shortcut_str in self.hotkeys.items():
-                if seq_str == shortcut_str:
-                    print(f"[RunScriptz] Global Filter Caught MATCH: {seq_str} -> {script_name}")
-                    
-                    # Run the script
-                    script_path = os.path.join(self.get_scripts_folder(), script_name)
-                    if os.path.exists(script_path):
-                        actions.run_script_from_path(script_path)
-                        return True # Consume event
-                    
-        return super().eventFilter(obj, event)
+        # Called for every event of the filtered object, keep the non-key path minimal
+        if event.type() != self._KP:
+            return False
+
+        key = event.key()
+
+        # Ignore modifier-only presses
+        if key in _MOD_KEYS:
+            return False
+
+        # Same encoding as QKeySequence(modifiers | key)[0], without building one
+        script_name = self._hotkey_codes.get(int(event.modifiers()) | key)
+        if script_name is None:
+            return False
+
+        # Check for docker toggle shortcut (Ctrl+Shift+D)
+        if script_name is _TOGGLE_DOCKER:
+            actions.log("Docker toggle shortcut pressed: Ctrl+Shift+D")
+            self.toggle_docker()
+            return True  # Consume event
+
+        # A match in our hotkeys
+        actions.log("Global Filter Caught MATCH: %s -> %s", self.hotkeys[script_name], script_name)
+
+        # Run the script
+        script_path = os.path.join(self._scripts_folder, script_name)
+        if os.path.exists(script_path):
+            actions.run_script_from_path(script_path)
+            return True # Consume event
+
+        return False
+
+    def set_dock(self, dock):
+        """Remember the RunScriptz dock so toggling it needs no docker lookup"""
+        self._dock_ref = weakref.ref(dock)
+
+    def _get_dock(self):
+        dock = self._dock_ref() if self._dock_ref else None
+        if dock is None:
+            # Dock created before the filter, find it once and keep it
+            dock = _find_dock()
+            if dock is not None:
+                self.set_dock(dock)
+        return dock
 
-    def get_scripts_folder(self):
-        # Helper to get config
-        try:
-            if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                    cfg = json.load(f)
-                    return cfg.get("scripts_folder", "")
-        except:
-            pass
-        return ""
-    
     def toggle_docker(self):
         """Toggle the RunScriptz docker visibility"""
         try:
-            for docker in Krita.instance().dockers():
-                if getattr(docker, "objectName", lambda: "")() == "RunScriptz":
-                    docker.setVisible(not docker.isVisible())
-                    if docker.isVisible():
-                        docker.raise_()
-                    print(f"[RunScriptz] Docker toggled: {'visible' if docker.isVisible() else 'hidden'}")
-                    return
+            docker = self._get_dock()
+            if docker is not None:
+                docker.setVisible(not docker.isVisible())
+                if docker.isVisible():
+                    docker.raise_()
+                actions.log("Docker toggled: %s", 'visible' if docker.isVisible() else 'hidden')
+        except RuntimeError as e:
+            # The dock's C++ side is gone (window closed), look it up again next time
+            self._dock_ref = None
+            actions.log("Error toggling docker: %s", e)
+        except Exception as e:
+            actions.log("Error toggling docker: %s", e)
+
+def scan_scripts_folder(folder):
+    """
+    Read the scripts folder for the dock, safe to run off the GUI thread.
+    Returns None if the folder isn't a directory, otherwise
+    (root_files, [(subfolder, files), ...]) where files are sorted (name, path)
+    pairs and only subfolders containing scripts are listed.
+    """
+    if not os.path.isdir(folder):
+        return None
+
+    root_files = []
+    subfolders = []
+    # Same walk as the hotkey registration, keys are "name.py" or "subfolder/name.py"
+    for key, path in actions.get_all_scripts(folder):
+        subfolder, sep, name = key.partition("/")
+        if not sep:
+            root_files.append((key, path))
+        elif subfolders and subfolders[-1][0] == subfolder:
+            subfolders[-1][1].append((name, path))
+        else:
+            subfolders.append((subfolder, [(name, path)]))
+    return root_files, subfolders
+
+
+class ScanSignals(QObject):
+    """Signals of ScanRunnable, a QRunnable can't emit on its own"""
+    done = pyqtSignal(int, object)  # generation, scan_scripts_folder() result
+
+
+class ScanRunnable(QRunnable):
+    """Scans the scripts folder on the global thread pool and reports back through a queued signal"""
+    def __init__(self, folder, generation):
+        super().__init__()
+        self.folder = folder
+        self.generation = generation
+        self.signals = ScanSignals()
+
+    def run(self):
+        try:
+            data = scan_scripts_folder(self.folder)
         except Exception as e:
-            print(f"[RunScriptz] Error toggling docker: {e}")
+            actions.log("Error scanning scripts folder: %s", e)
+            data = ([], [])
+        self.signals.done.emit(self.generation, data)
+
 
 class DebugInfoDialog(QDialog):
-    """Dialog to show debug info with copy button"""
+    """
+    Dialog to show debug info with copy button.
+    text can be a callable returning the text, it is then only called when
+    the dialog is first shown.
+    """
     def __init__(self, text, parent=None):
         super().__init__(parent)
         self.setWindowTitle("RunScriptz Debug Info")
         self.setModal(True)
         self.resize(600, 400)
+        self._text_source = text
 
         layout = QVBoxLayout(self)
 
         self.text_edit = QTextEdit()
         self.text_edit.setReadOnly(True)
-        self.text_edit.setText(text)
         layout.addWidget(self.text_edit)
 
         btn_layout = QHBoxLayout()
@@ -182,11 +273,18 @@ class DebugInfoDialog(QDialog):
 
         layout.addLayout(btn_layout)
 
+    def showEvent(self, event):
+        if self._text_source is not None:
+            text = self._text_source() if callable(self._text_source) else self._text_source
+            self._text_source = None
+            self.text_edit.setPlainText(text)
+        super().showEvent(event)
+
     def copy_to_clipboard(self):
         clipboard = QApplication.clipboard()
         clipboard.setText(self.text_edit.toPlainText())
         self.btn_copy.setText("Copied!")
-        QTimer.singleShot(2000, lambda: self.btn_copy.setText("Copy to Clipboard"))
+        QTimer.singleShot(2000, partial(self.btn_copy.setText, "Copy to Clipboard"))
 
 
 class RunScriptzDock(DockWidget):
@@ -277,34 +375,45 @@ class RunScriptzDock(DockWidget):
         self.scripts_folder = ""
         self.hotkeys = {}
         self.button_mode = False
-        self.script_buttons = []
+        self.script_buttons = {}  # filename -> QPushButton
+        self._buttons_folder = None
+        self._hotkeys_cache = None
+        self._root_scripts = []  # root script names from the last folder scan
+        self._scan_generation = 0
+        self._scan_signals = None
         self.load_config()
         self.load_hotkeys()
 
-        # Try to restore hotkeys from Krita's settings first
-        if self.scripts_folder:
-            actions.restore_hotkeys_from_krita_settings(self.scripts_folder)
-
         self.refresh_scripts()
 
-        # AUTO-REGISTER HOTKEYS: Set up a timer to automatically register hotkeys
-        # 1 second after the dock is created (when Krita is fully loaded)
-        self.auto_register_timer = QTimer()
-        self.auto_register_timer.setSingleShot(True)
-        self.auto_register_timer.timeout.connect(self.auto_register_hotkeys)
-        self.auto_register_timer.start(1000)  # 1 second delay
-        print("[RunScriptz] Auto-register timer started - will register hotkeys in 1 second")
+        # AUTO-REGISTER HOTKEYS: restoring and registering hotkeys waits for the
+        # first canvasChanged, when Krita's UI is actually up, instead of
+        # running while Krita is still creating its dockers
+        self._registered = False
+
+        # Let the global filter toggle this dock directly
+        shortcut_filter = getattr(self.get_extension_instance(), "shortcut_filter", None)
+        if shortcut_filter:
+            shortcut_filter.set_dock(self)
 
     def canvasChanged(self, canvas):
-        pass
+        if not self._registered:
+            self._registered = True
+            QTimer.singleShot(0, self.auto_register_hotkeys)
 
     def auto_register_hotkeys(self):
-        """Automatically register hotkeys 1 second after dock creation"""
-        print("[RunScriptz] Auto-registering hotkeys...")
+        """Automatically register hotkeys once Krita's UI is up (first canvasChanged)"""
+        actions.log("Auto-registering hotkeys...")
         if self.scripts_folder and os.path.isdir(self.scripts_folder):
             try:
+                # Try to restore hotkeys from Krita's settings first
+                if actions.restore_hotkeys_from_krita_settings(self.scripts_folder):
+                    # Show the restored hotkeys
+                    self._hotkeys_cache = None
+                    self.refresh_scripts()
+
                 # Register hotkeys without showing message boxes
-                print("[RunScriptz] Auto-registering hotkeys for scripts folder...")
+                actions.log("Auto-registering hotkeys for scripts folder...")
                 actions.register_actions_with_krita(self.scripts_folder, force_create_all=True)
 
                 # Also trigger extension registration
@@ -312,14 +421,20 @@ class RunScriptzDock(DockWidget):
                 if extension:
                     extension.start_delayed_hotkey_registration()
 
-                print("[RunScriptz] Auto-registration completed successfully")
+                actions.log("Auto-registration completed successfully")
             except Exception as e:
-                print(f"[RunScriptz] Auto-registration failed: {e}")
+                actions.log("Auto-registration failed: %s", e)
                 # Try again in 2 seconds if it failed
-                print("[RunScriptz] Retrying auto-registration in 2 seconds...")
+                actions.log("Retrying auto-registration in 2 seconds...")
                 QTimer.singleShot(2000, self.auto_register_hotkeys)
         else:
-            print("[RunScriptz] No scripts folder configured for auto-registration")
+            actions.log("No scripts folder configured for auto-registration")
+
+    def _get_hotkeys(self):
+        """Hotkeys for display, loaded once and kept until a hotkey or the folder changes"""
+        if self._hotkeys_cache is None:
+            self._hotkeys_cache = actions.load_hotkeys()
+        return self._hotkeys_cache
 
     # --- Mode switching ---
     def toggle_mode(self):
@@ -336,58 +451,72 @@ class RunScriptzDock(DockWidget):
             self.script_buttons_container.setVisible(False)
 
     def refresh_script_buttons(self):
-        """Refresh script buttons in button mode"""
-        # Clear existing buttons
-        for button in self.script_buttons:
+        """Refresh script buttons in button mode, only touching buttons that changed"""
+        # Buttons run a full script path, so start over when the folder changed
+        if self._buttons_folder != self.scripts_folder:
+            for button in self.script_buttons.values():
+                self.script_buttons_layout.removeWidget(button)
+                button.deleteLater()
+            self.script_buttons.clear()
+            self._buttons_folder = self.scripts_folder
+
+        # Root scripts from the last folder scan, already sorted
+        names = self._root_scripts
+
+        # Remove buttons of scripts that are gone
+        for fname in set(self.script_buttons) - set(names):
+            button = self.script_buttons.pop(fname)
+            self.script_buttons_layout.removeWidget(button)
             button.deleteLater()
-        self.script_buttons.clear()
-        
-        # Clear layout fully
-        while self.script_buttons_layout.count():
-            child = self.script_buttons_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-            elif child.spacerItem():
-                pass
-        
-        if not self.scripts_folder or not os.path.isdir(self.scripts_folder):
-            return
-        
+
+        # Add stretch at the end to keep buttons packed at top
+        if self.script_buttons_layout.count() == 0:
+            self.script_buttons_layout.addStretch()
+
         # Load hotkeys to show indicators
-        hotkeys = actions.load_hotkeys()
-        
-        for fname in sorted(os.listdir(self.scripts_folder)):
-            if not fname.endswith(".py"):
-                continue
-            
-            # Create button
-            button = QPushButton(fname)
-            # Ignored horizontal allows shrinking indefinitely (good for <250px)
-            # Fixed vertical prevents "too big" expanding
-            button.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Fixed)
-            
+        hotkeys = self._get_hotkeys()
+
+        for index, fname in enumerate(names):
+            button = self.script_buttons.get(fname)
+            if button is None:
+                # Existing buttons are already in sorted order, insert new ones in place
+                button = self.create_script_button(fname)
+                self.script_buttons_layout.insertWidget(index, button)
+                self.script_buttons[fname] = button
+
             # Add hotkey indicator if available
             if fname in hotkeys:
-                button.setText(f"{fname} [{hotkeys[fname]}]")
-                button.setToolTip(f"Script: {fname}\nHotkey: {hotkeys[fname]}\nClick to run")
+                text = f"{fname} [{hotkeys[fname]}]"
+                tooltip = f"Script: {fname}\nHotkey: {hotkeys[fname]}\nClick to run"
             else:
-                button.setToolTip(f"Script: {fname}\nClick to run")
-            
-            # Connect button click with proper closure
-            script_path = os.path.join(self.scripts_folder, fname)
-            def create_button_handler(path):
-                return lambda checked: self.run_script(path)
-            button.clicked.connect(create_button_handler(script_path))
-            
-            # Add context menu for hotkeys
-            button.setContextMenuPolicy(Qt.CustomContextMenu)
-            button.customContextMenuRequested.connect(lambda pos, name=fname: self.show_button_context_menu(pos, name))
-            
-            self.script_buttons_layout.addWidget(button)
-            self.script_buttons.append(button)
-            
-        # Add stretch at the end to keep buttons packed at top
-        self.script_buttons_layout.addStretch()
+                text = fname
+                tooltip = f"Script: {fname}\nClick to run"
+            if button.text() != text:
+                button.setText(text)
+            if button.toolTip() != tooltip:
+                button.setToolTip(tooltip)
+
+    def create_script_button(self, fname):
+        """Create the button for a root script in button mode"""
+        button = QPushButton(fname)
+        # Ignored horizontal allows shrinking indefinitely (good for <250px)
+        # Fixed vertical prevents "too big" expanding
+        button.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Fixed)
+
+        # clicked passes a checked flag, the partial's extra argument is dropped
+        script_path = os.path.join(self.scripts_folder, fname)
+        button.clicked.connect(partial(self._run_script_ignoring_arg, script_path))
+
+        # Add context menu for hotkeys
+        button.setContextMenuPolicy(Qt.CustomContextMenu)
+        button.customContextMenuRequested.connect(partial(self._show_button_context_menu_for, fname))
+        return button
+
+    def _run_script_ignoring_arg(self, path, *_):
+        self.run_script(path)
+
+    def _show_button_context_menu_for(self, script_name, pos):
+        self.show_button_context_menu(pos, script_name)
 
     def show_button_context_menu(self, pos, script_name):
         """Show context menu for script buttons"""
@@ -395,7 +524,7 @@ class RunScriptzDock(DockWidget):
         menu = QMenu()
         
         # Check if script already has a hotkey
-        hotkeys = actions.load_hotkeys()
+        hotkeys = self._get_hotkeys()
         has_hotkey = script_name in hotkeys
         
         assign_action = menu.addAction("Assign Hotkey")
@@ -419,33 +548,61 @@ class RunScriptzDock(DockWidget):
         folder = QFileDialog.getExistingDirectory(self, "Select Scripts Folder")
         if folder:
             self.scripts_folder = folder
+            self._hotkeys_cache = None
             self.save_config()
             self.refresh_scripts()
             self.register_hotkeys()
 
     # --- Scripts ---
     def refresh_scripts(self):
-        """Refresh scripts in both list and button modes"""
-        # Refresh list mode
-        self.script_list.clear() # Clears the QTreeWidget
-        if not self.scripts_folder or not os.path.isdir(self.scripts_folder):
+        """Refresh scripts in both list and button modes, reading the folder on a worker thread"""
+        self._scan_generation += 1
+        if not self.scripts_folder:
+            self._populate_tree(self._scan_generation, None)
+            return
+        runnable = ScanRunnable(self.scripts_folder, self._scan_generation)
+        runnable.signals.done.connect(self._populate_tree)
+        # The pool deletes the runnable after run(), keep its signals alive for the queued call
+        self._scan_signals = runnable.signals
+        QThreadPool.globalInstance().start(runnable)
+
+    def _populate_tree(self, generation, data):
+        """Fill the script tree from a finished scan (see scan_scripts_folder)"""
+        # A newer refresh was started while this scan ran, its result wins
+        if generation != self._scan_generation:
             return
+
+        root_files, subfolders = data or ([], [])
+        self._root_scripts = [fname for fname, fpath in root_files]
+
+        # Rebuild the tree with painting and signals off, items are created
+        # detached and inserted in one go instead of one model change each
+        tree = self.script_list
+        tree.setUpdatesEnabled(False)
+        tree.blockSignals(True)
+        try:
+            # Refresh list mode
+            tree.clear() # Clears the QTreeWidget
+            if data is not None:
+                self._add_tree_items(root_files, subfolders)
+        finally:
+            tree.blockSignals(False)
+            tree.setUpdatesEnabled(True)
         
+        # Refresh button mode if active
+        if self.button_mode:
+            self.refresh_script_buttons()
+
+    def _add_tree_items(self, root_files, subfolders):
+        """Add the scanned scripts to the (empty) script tree"""
         # Load hotkeys to show indicators
-        hotkeys = actions.load_hotkeys()
-        
-        # 1. Add files in root folder
-        root_files = []
-        try:
-            for fname in sorted(os.listdir(self.scripts_folder)):
-                fpath = os.path.join(self.scripts_folder, fname)
-                if os.path.isfile(fpath) and fname.endswith(".py"):
-                    root_files.append(fname)
-        except Exception:
-            pass
+        hotkeys = self._get_hotkeys()
+        top_items = []
+        category_items = []
 
-        for fname in root_files:
-            item = QTreeWidgetItem(self.script_list)
+        # 1. Add files in root folder
+        for fname, fpath in root_files:
+            item = QTreeWidgetItem()
             
             # Key for hotkey lookup (filename for root files)
             hotkey_key = fname
@@ -459,58 +616,47 @@ class RunScriptzDock(DockWidget):
             # Store relative path or key for hotkey logic
             item.setData(0, Qt.UserRole, fname) 
             # Store full path for running
-            item.setData(0, Qt.UserRole + 1, os.path.join(self.scripts_folder, fname))
+            item.setData(0, Qt.UserRole + 1, fpath)
+            top_items.append(item)
         
         # 2. Add subfolders and their scripts
-        try:
-            for dname in sorted(os.listdir(self.scripts_folder)):
-                dpath = os.path.join(self.scripts_folder, dname)
-                if os.path.isdir(dpath) and not dname.startswith('.'):
-                    # Check if there are python files inside
-                    sub_files = []
-                    try:
-                        for fname in sorted(os.listdir(dpath)):
-                            if fname.endswith(".py"):
-                                sub_files.append(fname)
-                    except:
-                        continue
-                        
-                    if sub_files:
-                        # Create Category Item
-                        category_item = QTreeWidgetItem(self.script_list)
-                        category_item.setText(0, dname)
-                        # Make category slightly different visual if needed, or just bold
-                        font = category_item.font(0)
-                        font.setBold(True)
-                        category_item.setFont(0, font)
-                        
-                        category_item.setExpanded(True)
-                        
-                        for fname in sub_files:
-                            script_item = QTreeWidgetItem(category_item)
-                            
-                            # Construct relative path for hotkey key: "Subfolder/script.py"
-                            # We normalize to forward slashes for consistency in JSON
-                            rel_path = f"{dname}/{fname}"
-                            fpath = os.path.join(dpath, fname)
-                            
-                            hotkey_key = rel_path
-                            
-                            display_text = fname
-                            if hotkey_key in hotkeys:
-                                display_text = f"{fname} [{hotkeys[hotkey_key]}]"
-                                script_item.setToolTip(0, f"Hotkey: {hotkeys[hotkey_key]}")
-                            
-                            script_item.setText(0, display_text)
-                            script_item.setData(0, Qt.UserRole, rel_path) # Relative path
-                            script_item.setData(0, Qt.UserRole + 1, fpath) # Full path
-                            
-        except Exception as e:
-            print(f"[RunScriptz] Error scanning subfolders: {e}")
-        
-        # Refresh button mode if active
-        if self.button_mode:
-            self.refresh_script_buttons()
+        for dname, sub_files in subfolders:
+            # Create Category Item
+            category_item = QTreeWidgetItem()
+            category_item.setText(0, dname)
+            # Make category slightly different visual if needed, or just bold
+            font = category_item.font(0)
+            font.setBold(True)
+            category_item.setFont(0, font)
+            
+            script_items = []
+            for fname, fpath in sub_files:
+                script_item = QTreeWidgetItem()
+                
+                # Construct relative path for hotkey key: "Subfolder/script.py"
+                # We normalize to forward slashes for consistency in JSON
+                rel_path = dname + "/" + fname
+                
+                hotkey_key = rel_path
+                
+                display_text = fname
+                if hotkey_key in hotkeys:
+                    display_text = f"{fname} [{hotkeys[hotkey_key]}]"
+                    script_item.setToolTip(0, f"Hotkey: {hotkeys[hotkey_key]}")
+                
+                script_item.setText(0, display_text)
+                script_item.setData(0, Qt.UserRole, rel_path) # Relative path
+                script_item.setData(0, Qt.UserRole + 1, fpath) # Full path
+                script_items.append(script_item)
+            
+            category_item.addChildren(script_items)
+            top_items.append(category_item)
+            category_items.append(category_item)
+
+        self.script_list.addTopLevelItems(top_items)
+        # Expanding only works once the item is in the tree
+        for category_item in category_items:
+            category_item.setExpanded(True)
 
     def run_selected_script(self):
         item = self.script_list.currentItem()
@@ -525,14 +671,13 @@ class RunScriptzDock(DockWidget):
 
     def run_script(self, path):
         if not os.path.exists(path):
-            print(f"[RunScriptz] Script not found: {path}")
+            actions.log("Script not found: %s", path)
             return
         try:
-            spec = importlib.util.spec_from_file_location("run_scriptz_external", path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            # Compiled code is cached per path and mtime, each run gets a fresh namespace
+            actions.exec_script(path)
         except Exception as e:
-            print(f"[RunScriptz] Error running {path}: {e}")
+            actions.log("Error running %s: %s", path, e)
 
     # --- Event filter ---
     def eventFilter(self, source, event):
@@ -559,7 +704,7 @@ class RunScriptzDock(DockWidget):
         menu = QMenu()
         
         # Check if script already has a hotkey
-        hotkeys = actions.load_hotkeys()
+        hotkeys = self._get_hotkeys()
         has_hotkey = script_key in hotkeys
         
         assign_action = menu.addAction("Assign Hotkey")
@@ -595,6 +740,8 @@ class RunScriptzDock(DockWidget):
                 success = actions.assign_hotkey_to_script(script_name, key_sequence, script_path)
                 
                 if success:
+                    self._hotkeys_cache = None
+
                     # Re-register actions to update shortcuts
                     self.register_hotkeys()
                     
@@ -609,6 +756,7 @@ class RunScriptzDock(DockWidget):
     def remove_hotkey(self, script_name):
         """Remove hotkey from a script"""
         actions.remove_hotkey_from_script(script_name)
+        self._hotkeys_cache = None
         
         # Re-register actions to update shortcuts
         self.register_hotkeys()
@@ -645,10 +793,18 @@ class RunScriptzDock(DockWidget):
             return
             
         try:
-            # Use explorer /select, <path> to highlight the file
-            subprocess.Popen(f'explorer /select,"{path}"')
+            # Only needed here, don't pay for the import at plugin load
+            import subprocess
+            # Use explorer /select, <path> to highlight the file. An argv list
+            # leaves the quoting of the path to subprocess, and explorer is
+            # started detached so Krita keeps no handle on it
+            subprocess.Popen(
+                ["explorer", "/select,", path],
+                creationflags=getattr(subprocess, "DETACHED_PROCESS", 0) | getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0),
+                close_fds=True
+            )
         except Exception as e:
-            print(f"[RunScriptz] Error revealing file: {e}")
+            actions.log("Error revealing file: %s", e)
             QMessageBox.warning(self, "Error", f"Could not reveal file:\n{e}")
 
     def test_hotkey_assignment(self):
@@ -661,10 +817,10 @@ class RunScriptzDock(DockWidget):
         test_script = "debug_hotkey.py"
         test_key = "Ctrl+1"
         
-        print(f"[RunScriptz] Testing hotkey assignment...")
-        print(f"[RunScriptz] Script: {test_script}")
-        print(f"[RunScriptz] Key: {test_key}")
-        print(f"[RunScriptz] Scripts folder: {self.scripts_folder}")
+        actions.log("Testing hotkey assignment...")
+        actions.log("Script: %s", test_script)
+        actions.log("Key: %s", test_key)
+        actions.log("Scripts folder: %s", self.scripts_folder)
         
         script_path = os.path.join(self.scripts_folder, test_script)
         
@@ -704,12 +860,12 @@ if __name__ == "__main__":
             try:
                 with open(script_path, 'w', encoding='utf-8') as f:
                     f.write(debug_script_content)
-                print(f"[RunScriptz] Created debug script: {script_path}")
+                actions.log("Created debug script: %s", script_path)
             except Exception as e:
-                print(f"[RunScriptz] Error creating debug script: {e}")
+                actions.log("Error creating debug script: %s", e)
         
-        print(f"[RunScriptz] Script path: {script_path}")
-        print(f"[RunScriptz] Script exists: {os.path.exists(script_path)}")
+        actions.log("Script path: %s", script_path)
+        actions.log("Script exists: %s", os.path.exists(script_path))
         
         success = actions.assign_hotkey_to_script(test_script, test_key, script_path)
 
@@ -727,7 +883,7 @@ if __name__ == "__main__":
         if not self.scripts_folder:
             return
 
-        print("[RunScriptz] Dock widget registering hotkeys...")
+        actions.log("Dock widget registering hotkeys...")
         # Use the actions module to register all script actions (force create all)
         actions.register_actions_with_krita(self.scripts_folder, force_create_all=True)
 
@@ -735,15 +891,14 @@ if __name__ == "__main__":
         extension = self.get_extension_instance()
         if extension:
             extension.start_delayed_hotkey_registration()
+            # The global filter caches hotkeys and folder, let it pick up the change
+            shortcut_filter = getattr(extension, "shortcut_filter", None)
+            if shortcut_filter:
+                shortcut_filter.load_hotkeys()
 
     def get_extension_instance(self):
         """Get the extension instance"""
-        app = Krita.instance()
-        if app:
-            for extension in app.extensions():
-                if isinstance(extension, RunScriptzExtension):
-                    return extension
-        return None
+        return RunScriptzExtension._singleton
 
     def force_register_hotkeys(self):
         """Force re-registration of all hotkeys"""
@@ -752,8 +907,8 @@ if __name__ == "__main__":
             return
 
         try:
-            # Direct registration (force create all actions)
-            actions.register_actions_with_krita(self.scripts_folder, force_create_all=True)
+            # Direct registration (force create all actions and re-apply every shortcut)
+            actions.register_actions_with_krita(self.scripts_folder, force_create_all=True, force=True)
 
             # Also trigger extension registration
             extension = self.get_extension_instance()
@@ -767,95 +922,101 @@ if __name__ == "__main__":
 
     def debug_shortcuts(self):
         """Debug shortcut information"""
-        log = []
-        log.append("=== RunScriptz Debug Info ===")
-        
-        # Debug our JSON file
+        # The report is only built once the dialog is shown
+        dialog = DebugInfoDialog(self._debug_text, self)
+        dialog.exec_()
+
+    def _debug_text(self):
+        full_log = "\n".join(self._debug_lines())
+        if actions.DEBUG:
+            print(full_log)
+        return full_log
+
+    def _debug_lines(self):
+        """Lines of the debug report"""
         hotkeys = actions.load_hotkeys()
-        log.append(f"[JSON] Hotkeys file: {len(hotkeys)} entries")
-        for script, key in hotkeys.items():
-            log.append(f"  {script} -> {key}")
+        # One pass over Krita's actions instead of an action() lookup per script
+        known = actions.get_known_actions()
 
-        # Debug Krita's shortcuts
-        log.append("\n[Krita Settings]")
-        log.append(actions.debug_krita_shortcuts())
+        # One pass over the hotkeys fills both the JSON and the actions section
+        json_lines = []
+        action_lines = []
+        for script, key in hotkeys.items():
+            json_lines.append(f"  {script} -> {key}")
 
-        # Debug current actions
-        log.append("\n[Current Window Actions (via Krita.instance().action())]")
-        app = Krita.instance()
-        # We check Krita.instance().action() which is the reliable way to find actions
-        for script in hotkeys.keys():
-            action_id = f"run_scriptz_{script}"
+            action_id = actions.get_action_id_for_key(script)
             try:
-                action = app.action(action_id)
+                action = known.get(action_id)
                 if action:
-                    shortcut = action.shortcut().toString()
-                    log.append(f"  Action {action_id}: FOUND, shortcut = '{shortcut}'")
-                    if action.isEnabled():
-                        log.append(f"    - Enabled: Yes")
-                    else:
-                        log.append(f"    - Enabled: No")
+                    # All of the action's shortcuts formatted in one call ("A; B")
+                    shortcut = QKeySequence.listToString(action.shortcuts())
+                    action_lines.append(f"  Action {action_id}: FOUND, shortcut = '{shortcut}'")
+                    # Without a shortcut there is nothing a keypress could trigger
+                    if shortcut:
+                        action_lines.append(f"    - Enabled: {'Yes' if action.isEnabled() else 'No'}")
                 else:
-                    log.append(f"  Action {action_id}: NOT FOUND in Krita.instance().action()")
+                    action_lines.append(f"  Action {action_id}: NOT FOUND in Krita.instance().actions()")
             except Exception as e:
-                log.append(f"  Action {action_id}: ERROR - {e}")
-        
-        log.append("\n=== End Debug Info ===")
+                action_lines.append(f"  Action {action_id}: ERROR - {e}")
+
+        yield "=== RunScriptz Debug Info ==="
         
-        full_log = "\n".join(log)
-        print(full_log) # Still print to console just in case
+        # Debug our JSON file
+        yield f"[JSON] Hotkeys file: {len(hotkeys)} entries"
+        yield from json_lines
 
-        # Show dialog
-        dialog = DebugInfoDialog(full_log, self)
-        dialog.exec_()
+        # Debug Krita's shortcuts
+        yield "\n[Krita Settings]"
+        yield actions.debug_krita_shortcuts()
+
+        # Debug current actions
+        yield "\n[Current Window Actions (via Krita.instance().actions())]"
+        yield from action_lines
+        
+        yield "\n=== End Debug Info ==="
 
     # --- Config ---
     def load_config(self):
-        try:
-            if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                    cfg = json.load(f)
-                    self.scripts_folder = cfg.get("scripts_folder", "")
-        except Exception:
-            self.scripts_folder = ""
+        self.scripts_folder = get_scripts_folder()
 
     def save_config(self):
         try:
-            os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
-            with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-                json.dump({"scripts_folder": self.scripts_folder}, f, indent=2)
+            actions.write_json_file(actions.get_config_file(), {"scripts_folder": self.scripts_folder})
         except Exception:
             pass
 
     def load_hotkeys(self):
         try:
-            if os.path.exists(HOTKEY_FILE):
-                with open(HOTKEY_FILE, "r", encoding="utf-8") as f:
-                    self.hotkeys = json.load(f)
+            self.hotkeys = dict(actions.load_json_cached(actions.get_hotkey_file()))
+        except FileNotFoundError:
+            pass
         except Exception:
             self.hotkeys = {}
 
     def save_hotkeys(self):
         try:
-            os.makedirs(os.path.dirname(HOTKEY_FILE), exist_ok=True)
-            with open(HOTKEY_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.hotkeys, f, indent=2)
+            actions.write_json_file(actions.get_hotkey_file(), self.hotkeys)
         except Exception:
             pass
 
 
 class RunScriptzExtension(Extension):
+    # The instance Krita loaded, for the dock to reach without scanning app.extensions()
+    _singleton = None
+
     def __init__(self, parent):
         super().__init__(parent)
+        RunScriptzExtension._singleton = self
         self.dock_factory = None
-        self.scripts_folder = ""
-        self.hotkey_registration_timer = None
-        self.registration_attempts = 0
-        self.max_registration_attempts = 10
-        self.load_config()
+        self._waiting_for_window = False
+        self._registration_done = False
+        self.backup_register_timer = None
+        self._checked_folder = None  # folder _scripts_folder_valid was computed for
+        self._scripts_folder_valid = False
+        self.scripts_folder = get_scripts_folder()
 
         # Try to create actions immediately if we have a scripts folder
-        print("[RunScriptz] Extension __init__ - attempting immediate action creation...")
+        actions.log("Extension __init__ - attempting immediate action creation...")
         # REMOVED: potentially creating windowless actions that conflict
         # if self.scripts_folder:
         #    actions.ensure_actions_exist_on_startup()
@@ -869,87 +1030,103 @@ class RunScriptzExtension(Extension):
         Krita.instance().addDockWidgetFactory(self.dock_factory)
 
         # CRITICAL: Try to ensure actions exist immediately in setup
-        print("[RunScriptz] Extension setup - attempting immediate action creation...")
+        actions.log("Extension setup - attempting immediate action creation...")
         # REMOVED: relying on createActions to provide the window
         # actions.ensure_actions_exist_on_startup()
 
-        # Start delayed hotkey registration as backup
-        self.start_delayed_hotkey_registration()
-
         # BACKUP: Set up a timer to auto-register hotkeys even if dock isn't opened
-        # This ensures hotkeys work even if user never opens the dock
+        # This ensures hotkeys work even if user never opens the dock.
+        # Stopped as soon as the regular registration succeeds.
         self.backup_register_timer = QTimer()
         self.backup_register_timer.setSingleShot(True)
         self.backup_register_timer.timeout.connect(self.backup_auto_register)
         self.backup_register_timer.start(3000)  # 3 seconds after extension setup
-        print("[RunScriptz] Backup auto-register timer started - will register in 3 seconds")
+        actions.log("Backup auto-register timer started - will register in 3 seconds")
 
-    def load_config(self):
-        """Load configuration to get scripts folder"""
-        try:
-            if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                    cfg = json.load(f)
-                    self.scripts_folder = cfg.get("scripts_folder", "")
-        except Exception:
-            self.scripts_folder = ""
+        # Start delayed hotkey registration
+        self.start_delayed_hotkey_registration()
+
+    def _scripts_folder_ok(self):
+        """
+        Whether scripts_folder is set and a directory.
+        Only a positive result is kept per folder value: a network or removable
+        drive may not be mounted yet, so a missing folder is checked again next time.
+        """
+        folder = self.scripts_folder
+        if folder != self._checked_folder or not self._scripts_folder_valid:
+            self._checked_folder = folder
+            self._scripts_folder_valid = bool(folder) and os.path.isdir(folder)
+        return self._scripts_folder_valid
 
     def start_delayed_hotkey_registration(self):
-        """Start delayed hotkey registration with multiple attempts"""
-        if not self.scripts_folder or not os.path.isdir(self.scripts_folder):
-            print("[RunScriptz] No scripts folder configured, skipping hotkey registration")
+        """Register hotkeys now if Krita has a window, otherwise once the first window is created"""
+        if not self._scripts_folder_ok():
+            actions.log("No scripts folder configured, skipping hotkey registration")
+            return
+
+        app = Krita.instance()
+        if app.activeWindow():
+            self.attempt_hotkey_registration()
             return
 
-        print("[RunScriptz] Starting delayed hotkey registration...")
-        self.registration_attempts = 0
+        if self._waiting_for_window:
+            return
+        actions.log("No active window yet, registering hotkeys when one is created...")
+        self._waiting_for_window = True
+        notifier = app.notifier()
+        notifier.setActive(True)
+        notifier.windowCreated.connect(self._on_window_ready)
+        # Fallback in case the signal never comes
+        QTimer.singleShot(5000, self._on_window_ready)
+
+    def _on_window_ready(self):
+        """First window created (or the fallback fired), register once and stop listening"""
+        if not self._waiting_for_window:
+            return
+        self._waiting_for_window = False
+        try:
+            Krita.instance().notifier().windowCreated.disconnect(self._on_window_ready)
+        except TypeError:
+            pass
         self.attempt_hotkey_registration()
 
     def attempt_hotkey_registration(self):
-        """Attempt to register hotkeys with retry logic"""
-        self.registration_attempts += 1
-        print(f"[RunScriptz] Hotkey registration attempt {self.registration_attempts}/{self.max_registration_attempts}")
-
-        app = Krita.instance()
-        window = app.activeWindow() if app else None
-
-        if window:
-            print("[RunScriptz] Active window found, registering hotkeys...")
-            try:
-                actions.register_actions_with_krita(self.scripts_folder)
-                print("[RunScriptz] Hotkey registration completed successfully")
-                return  # Success, stop trying
-            except Exception as e:
-                print(f"[RunScriptz] Error during hotkey registration: {e}")
-        else:
-            print("[RunScriptz] No active window found yet")
-
-        # If we haven't succeeded and haven't reached max attempts, try again
-        if self.registration_attempts < self.max_registration_attempts:
-            delay = min(2000 * self.registration_attempts, 10000)  # Increasing delay, max 10 seconds
-            print(f"[RunScriptz] Retrying in {delay/1000} seconds...")
-            self.hotkey_registration_timer = QTimer()
-            self.hotkey_registration_timer.setSingleShot(True)
-            self.hotkey_registration_timer.timeout.connect(self.attempt_hotkey_registration)
-            self.hotkey_registration_timer.start(delay)
-        else:
-            print("[RunScriptz] Max registration attempts reached, giving up")
+        """Register hotkeys, register_actions_with_krita waits for the window itself if needed"""
+        actions.log("Registering hotkeys...")
+        try:
+            if not actions.register_actions_with_krita(self.scripts_folder):
+                # Skipped or retrying, the backup timer gets another go
+                actions.log("Hotkey registration not done yet")
+                return
+            actions.log("Hotkey registration completed successfully")
+            self._registration_done = True
+            if self.backup_register_timer is not None:
+                self.backup_register_timer.stop()
+        except Exception as e:
+            actions.log("Error during hotkey registration: %s", e)
 
     def backup_auto_register(self):
         """Backup auto-registration that runs even if dock isn't opened"""
-        print("[RunScriptz] Backup auto-registration triggered...")
-        if self.scripts_folder and os.path.isdir(self.scripts_folder):
+        if self._registration_done:
+            actions.log("Hotkeys already registered, skipping backup registration")
+            return
+        actions.log("Backup auto-registration triggered...")
+        if self._scripts_folder_ok():
             try:
-                print("[RunScriptz] Running backup hotkey registration...")
-                actions.register_actions_with_krita(self.scripts_folder, force_create_all=True)
-                print("[RunScriptz] Backup auto-registration completed")
+                actions.log("Running backup hotkey registration...")
+                if actions.register_actions_with_krita(self.scripts_folder, force_create_all=True):
+                    self._registration_done = True
+                    actions.log("Backup auto-registration completed")
+                else:
+                    actions.log("Backup auto-registration skipped")
             except Exception as e:
-                print(f"[RunScriptz] Backup auto-registration failed: {e}")
+                actions.log("Backup auto-registration failed: %s", e)
         else:
-            print("[RunScriptz] No scripts folder for backup registration")
+            actions.log("No scripts folder for backup registration")
 
     def register_startup_hotkeys(self):
         """Register hotkeys when Krita starts up - legacy method"""
-        if self.scripts_folder and os.path.isdir(self.scripts_folder):
+        if self._scripts_folder_ok():
             # Use the actions module to register all script actions
             actions.register_actions_with_krita(self.scripts_folder)
 
@@ -958,15 +1135,26 @@ class RunScriptzExtension(Extension):
         show_action = window.createAction("run_scriptz_show", "Show RunScriptz", "tools/scripts")
         show_action.triggered.connect(self.show_dock)
 
-        # CRITICAL: Ensure all script actions with hotkeys exist immediately
-        print("[RunScriptz] Window created - installing global event filter...")
-        
-        # Strategy C: Global Event Filter on QApplication
-        # This catches keys even if the main window focus is weird (e.g. on a docker)
-        if not hasattr(self, 'shortcut_filter'):
-            self.shortcut_filter = RunScriptzShortcutFilter(QApplication.instance())
-            QApplication.instance().installEventFilter(self.shortcut_filter)
-            print("[RunScriptz] Global event filter installed on QApplication")
+        # Menu action to toggle the dock. It has no default shortcut: Krita
+        # binds Ctrl+Shift+D to Reselect, so users pick a key for it in
+        # Krita's shortcut settings, where clashes can be resolved.
+        toggle_action = window.createAction("run_scriptz_toggle_dock", "Toggle RunScriptz", "tools/scripts")
+        toggle_action.triggered.connect(self.toggle_dock)
+
+        # Script hotkeys are the ApplicationShortcut actions registered by
+        # actions.py, Qt matches those in C++ without calling into Python for
+        # every key event.
+        qwindow = window.qwindow()
+
+        # Strategy C: Event filter on the main window, only as a debugging
+        # fallback (RUNSCRIPTZ_EVENT_FILTER=1) for when Krita's action
+        # shortcuts don't fire. createActions runs once per window, so each
+        # new window gets it here; Qt drops the filter when a window is destroyed.
+        if _USE_EVENT_FILTER and qwindow is not None:
+            if not hasattr(self, 'shortcut_filter'):
+                self.shortcut_filter = RunScriptzShortcutFilter(QApplication.instance())
+            qwindow.installEventFilter(self.shortcut_filter)
+            actions.log("Event filter installed on the main window")
         
         # We still create the actions for visual feedback (menu items)
         # But we do it once, cleanly.
@@ -981,47 +1169,35 @@ class RunScriptzExtension(Extension):
             # Load hotkeys (now updated from Krita settings)
             hotkeys = actions.load_hotkeys()
 
-            print(f"[RunScriptz] Creating actions for {len(hotkeys)} scripts with hotkeys")
+            actions.log("Creating actions for %s scripts with hotkeys", len(hotkeys))
 
-            # Create actions for all scripts that have hotkeys
-            for filename in os.listdir(self.scripts_folder):
-                if not filename.endswith(".py"):
-                    continue
+            # Create actions for the root folder's scripts, with their shortcut if they have one
+            specs = [
+                (actions.get_action_id_for_key(name), actions.ACTION_TEXT_PREFIX + name,
+                 path, hotkeys.get(name, ""))
+                for name, path in actions.get_all_scripts_cached(self.scripts_folder)
+                if "/" not in name
+            ]
+            count = actions.register_action_batch(window, specs)
+            actions.flush_shortcut_settings()
+            actions.log("Created %s actions", count)
 
-                script_path = os.path.join(self.scripts_folder, filename)
-                action_id = f"run_scriptz_{filename}"
-                action_text = f"RunScriptz: {filename}"
-
-                try:
-                    # Create the action
-                    action = window.createAction(action_id, action_text, "tools/scripts")
-
-                    if action:
-                        # Connect to script execution with proper closure
-                        def create_action_handler(path):
-                            return lambda: actions.run_script_from_path(path)
-                        action.triggered.connect(create_action_handler(script_path))
-
-                        # Set shortcut if available
-                        if filename in hotkeys:
-                            shortcut = QKeySequence(hotkeys[filename])
-                            action.setShortcut(shortcut)
-                            action.setShortcutContext(Qt.ApplicationShortcut)
-                            print(f"[RunScriptz] Created action with shortcut: {filename} -> {hotkeys[filename]}")
-                        else:
-                            print(f"[RunScriptz] Created action without shortcut: {filename}")
-
-                except Exception as e:
-                    print(f"[RunScriptz] Error creating action for {filename}: {e}")
-
-            print("[RunScriptz] Finished creating script actions")
+            actions.log("Finished creating script actions")
 
         except Exception as e:
-            print(f"[RunScriptz] Error in create_script_actions_immediately: {e}")
+            actions.log("Error in create_script_actions_immediately: %s", e)
 
-    def show_dock(self):
-        for d in Krita.instance().dockers():
-            if getattr(d, "objectName", lambda: "")() == "RunScriptz":
-                d.setVisible(True)
+    def toggle_dock(self):
+        """Toggle the RunScriptz docker visibility"""
+        d = _find_dock()
+        if d is not None:
+            d.setVisible(not d.isVisible())
+            if d.isVisible():
                 d.raise_()
-                return
+            actions.log("Docker toggled: %s", 'visible' if d.isVisible() else 'hidden')
+
+    def show_dock(self):
+        d = _find_dock()
+        if d is not None:
+            d.setVisible(True)
+            d.raise_()